@@ -2,6 +2,10 @@ import curses
 import threading
 import time
 import random
+import queue
+import unicodedata
+from collections import deque
+from scheduler import Sampler
 
 # Global simulation state
 leak_mode = False  # When True, simulate a leak (high water usage)
@@ -11,29 +15,40 @@ threshold = 1.5  # Usage (liters) above which we consider it high
 
 # Set simulated minute duration (60 seconds for real-time, change to 1 for testing)
 minute_duration = 1
+sample_period = minute_duration  # Seconds between flow sensor samples (0.1 to 60, must divide minute_duration)
+
+# Maximum screen refresh rate of the console (frames per second)
+refresh_rate = 20
 
 # Lock for thread-safe access
 state_lock = threading.Lock()
 
+# Only the rendering thread touches curses; everything else talks to it through these queues
+reading_queue = queue.Queue()  # Lines for the usage window
+command_queue = queue.Queue()  # Commands typed by the user
+message_queue = queue.Queue()  # Responses shown under the prompt
+
+PROMPT = "💻 Enter command ('make a leak', 'stop leak', 'stop water', 'start water', 'status'):"
+
+
+def read_flow_rate():
+    """One flow sensor sample, in liters per simulated minute."""
+    with state_lock:
+        if water_shutoff:
+            return 0.0
+        return random.uniform(2.0, 3.0) if leak_mode else random.uniform(0.4, 1.0)
+
 
-def water_simulation(win_usage):
+def water_simulation():
     global leak_mode, water_shutoff, high_usage_counter
-    row = 0  # Start row for printing in usage window
+    # Drift-free sampling, averaged per simulated minute; tick problems go to the usage window
+    sampler = Sampler(minute_duration, sample_period, report=reading_queue.put)
     while True:
-        with state_lock:
-            if water_shutoff:
-                usage = 0.0
-            else:
-                usage = round(random.uniform(2.0, 3.0), 2) if leak_mode else round(random.uniform(0.4, 1.0), 2)
+        usage = sampler.read_minute(read_flow_rate)
 
         # Display water usage with timestamp
         timestamp = time.strftime('%H:%M:%S')
-        win_usage.addstr(row, 0, f"{timestamp} 🚰 Usage: {usage} L{' ' * 10}")
-        win_usage.refresh()
-        row += 1
-        if row >= (win_usage.getmaxyx()[0] - 1):  # reset when window is full
-            win_usage.clear()
-            row = 0
+        reading_queue.put(f"{timestamp} 🚰 Usage: {usage} L")
 
         # Check usage and count high usage minutes
         with state_lock:
@@ -44,77 +59,212 @@ def water_simulation(win_usage):
 
         # If high usage persists for 5 minutes, start the shutoff procedure.
         if high_usage_counter >= 5:
-            win_usage.addstr(row, 0, "⚠️  Leak detected! Waiting 2 minutes for user response...    ")
-            win_usage.refresh()
+            reading_queue.put("⚠️  Leak detected! Waiting 2 minutes for user response...")
             for i in range(2):
-                time.sleep(minute_duration)
+                sampler.wait_minutes()
                 with state_lock:
                     if water_shutoff or not leak_mode:
-                        win_usage.addstr(row + 1, 0, "✅  Leak resolved during waiting period.           ")
+                        reading_queue.put("✅  Leak resolved during waiting period.")
                         high_usage_counter = 0
                         break
-                win_usage.addstr(row + 1, 0, f"⏰  Waiting... ({i + 1}/2)           ")
-                win_usage.refresh()
+                reading_queue.put(f"⏰  Waiting... ({i + 1}/2)")
             else:
                 with state_lock:
                     if leak_mode and not water_shutoff:
                         water_shutoff = True
-                        win_usage.addstr(row + 2, 0, "🔒  No response. Water has been automatically shut off!")
-                        win_usage.refresh()
-        time.sleep(minute_duration)
+                        reading_queue.put("🔒  No response. Water has been automatically shut off!")
 
 
-def command_listener(stdscr):
+def apply_command(cmd):
+    """Apply a console command to the simulation state and return the response text."""
     global leak_mode, water_shutoff, high_usage_counter
+    with state_lock:
+        if cmd == "make a leak":
+            leak_mode = True
+            return "💥 Leak simulation activated!"
+        elif cmd == "stop leak":
+            leak_mode = False
+            high_usage_counter = 0
+            return "👍 Leak simulation deactivated!"
+        elif cmd == "stop water":
+            water_shutoff = True
+            return "🔒 Water manually shut off!"
+        elif cmd == "start water":
+            water_shutoff = False
+            high_usage_counter = 0
+            return "🚰 Water resumed!"
+        elif cmd == "status":
+            return f"Leak mode: {leak_mode} | Water shutoff: {water_shutoff} | High usage counter: {high_usage_counter}"
+        else:
+            return "❓ Unknown command."
+
+
+def command_worker():
+    """Consume typed commands so state changes never block the rendering thread."""
+    while True:
+        cmd = command_queue.get()
+        message_queue.put(apply_command(cmd))
+
+
+def clip(text, columns):
+    """Cut text to at most `columns` terminal cells; emojis and other wide characters take two."""
+    used = 0
+    for i, char in enumerate(text):
+        if unicodedata.combining(char) or char in "\u200d\ufe0f":
+            continue  # Zero-width joiners, variation selectors and combining marks
+        wide = unicodedata.east_asian_width(char) in "WF" or text[i + 1:i + 2] == "\ufe0f"
+        used += 2 if wide else 1
+        if used > columns:
+            return text[:i].rstrip("\u200d")  # Don't leave half of a joined emoji behind
+    return text
+
+
+def put_line(win, row, text):
+    """Overwrite one row of a window, clipped to its display width so it never wraps."""
+    width = win.getmaxyx()[1]
+    try:
+        win.move(row, 0)
+        win.clrtoeol()
+        win.addstr(row, 0, clip(text, width - 1))
+    except curses.error:
+        pass  # A terminal that draws a character wider than expected; scrolling is off, so nothing moves
+
+
+class UsageView:
+    """Scrolling view over the most recent readings, kept in a ring buffer.
+
+    New lines are only drawn once per frame: the window is scrolled by the number
+    of new lines and just those rows are written, instead of clearing everything.
+    """
+
+    def __init__(self, win):
+        self.win = win
+        self.rows = win.getmaxyx()[0]
+        self.lines = deque(maxlen=self.rows)
+        self.shown = 0  # Rows currently in use on screen
+        self.pending = 0  # Lines received since the last draw
+        win.idlok(True)  # scrollok stays off so a long line can never scroll the window behind our back
+
+    def push(self, line):
+        self.lines.append(line)
+        self.pending += 1
+
+    def draw(self):
+        """Stage the changes with noutrefresh; return False when there is nothing to draw."""
+        if not self.pending:
+            return False
+        if self.pending >= self.rows:
+            # More new lines than fit on screen: repaint from the ring buffer
+            self.win.erase()
+            for row, line in enumerate(self.lines):
+                put_line(self.win, row, line)
+            self.shown = len(self.lines)
+        else:
+            overflow = max(0, self.shown + self.pending - self.rows)
+            if overflow:
+                self.win.scrollok(True)
+                self.win.scroll(overflow)
+                self.win.scrollok(False)
+            start = self.shown - overflow
+            new_lines = list(self.lines)[-self.pending:]
+            for offset, line in enumerate(new_lines):
+                put_line(self.win, start + offset, line)
+            self.shown = start + self.pending
+        self.pending = 0
+        self.win.noutrefresh()
+        return True
+
+
+class CommandPrompt:
+    """Three-line input area: prompt, the line being typed and the last response."""
+
+    def __init__(self, win):
+        self.win = win
+        self.buffer = ""
+        self.message = ""
+        self.dirty = {0, 1, 2}  # Rows that need to be redrawn
+        win.keypad(True)
+
+    def handle_key(self, key):
+        if key in (curses.KEY_ENTER, 10, 13):
+            cmd = self.buffer.strip().lower()
+            if cmd:
+                command_queue.put(cmd)
+            self.buffer = ""
+        elif key in (curses.KEY_BACKSPACE, 127, 8):
+            self.buffer = self.buffer[:-1]
+        elif 32 <= key < 127:
+            self.buffer += chr(key)
+        else:
+            return
+        self.dirty.add(1)
+
+    def show(self, message):
+        self.message = message
+        self.dirty.add(2)
+
+    def draw(self):
+        """Stage the changed rows with noutrefresh; return False when nothing changed."""
+        if not self.dirty:
+            return False
+        texts = (PROMPT, f"> {self.buffer}", self.message)
+        for row in sorted(self.dirty):
+            put_line(self.win, row, texts[row])
+        self.dirty.clear()
+        self.win.noutrefresh()
+        return True
+
+
+def render_loop(stdscr):
+    """Single rendering thread: reads keys, drains the queues and paints at most refresh_rate times per second."""
     height, width = stdscr.getmaxyx()
-    # Create a window for command input at the bottom (3 lines tall)
+    # Window for water usage logs (rest of screen above the input window)
+    view = UsageView(curses.newwin(height - 3, width, 0, 0))
+    # Window for command input at the bottom (3 lines tall)
     input_win = curses.newwin(3, width, height - 3, 0)
-    input_win.timeout(100)  # non-blocking getch
+    prompt = CommandPrompt(input_win)
+
+    frame_interval = 1 / refresh_rate
+    input_win.timeout(int(frame_interval * 1000))  # getch also paces the loop
+    next_frame = time.monotonic()
     while True:
-        input_win.clear()
-        input_win.addstr(0, 0, "💻 Enter command ('make a leak', 'stop leak', 'stop water', 'start water', 'status'):")
-        input_win.refresh()
-        curses.echo()
-        # Get user input (blocking call)
-        cmd = input_win.getstr(1, 0).decode("utf-8").strip().lower()
-        curses.noecho()
-        with state_lock:
-            if cmd == "make a leak":
-                leak_mode = True
-                input_win.addstr(2, 0, "💥 Leak simulation activated!")
-            elif cmd == "stop leak":
-                leak_mode = False
-                high_usage_counter = 0
-                input_win.addstr(2, 0, "👍 Leak simulation deactivated!")
-            elif cmd == "stop water":
-                water_shutoff = True
-                input_win.addstr(2, 0, "🔒 Water manually shut off!")
-            elif cmd == "start water":
-                water_shutoff = False
-                high_usage_counter = 0
-                input_win.addstr(2, 0, "🚰 Water resumed!")
-            elif cmd == "status":
-                status = f"Leak mode: {leak_mode} | Water shutoff: {water_shutoff} | High usage counter: {high_usage_counter}"
-                input_win.addstr(2, 0, status)
-            else:
-                input_win.addstr(2, 0, "❓ Unknown command.")
-            input_win.refresh()
-            time.sleep(1)
+        key = input_win.getch()
+        if key != -1:
+            prompt.handle_key(key)
+
+        now = time.monotonic()
+        if now < next_frame:
+            continue
+        next_frame = now + frame_interval
+
+        # Drain everything that arrived since the last frame; the ring buffer keeps only what fits
+        try:
+            while True:
+                view.push(reading_queue.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            while True:
+                prompt.show(message_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        usage_changed = view.draw()
+        prompt_changed = prompt.draw()
+        if usage_changed or prompt_changed:
+            curses.doupdate()
 
 
 def main(stdscr):
     curses.curs_set(0)  # Hide cursor
-    height, width = stdscr.getmaxyx()
-    # Create a window for water usage logs (rest of screen above the input window)
-    usage_win = curses.newwin(height - 3, width, 0, 0)
-    usage_win.box()
+    curses.noecho()  # Typed characters are drawn by the prompt itself
 
-    # Start simulation in a separate thread
-    simulation_thread = threading.Thread(target=water_simulation, args=(usage_win,), daemon=True)
-    simulation_thread.start()
+    # Start simulation and command handling in separate threads
+    threading.Thread(target=water_simulation, daemon=True).start()
+    threading.Thread(target=command_worker, daemon=True).start()
 
-    # Start command listener (runs in the main thread with its own window)
-    command_listener(stdscr)
+    # Render the console (runs in the main thread, the only one using curses)
+    render_loop(stdscr)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,111 @@
+import time
+
+# Supported sampling periods (in seconds): from 10 Hz up to one reading per minute
+MIN_PERIOD = 0.1
+MAX_PERIOD = 60.0
+
+
+class Ticker:
+    """Fixed-rate scheduler driven by the monotonic clock.
+
+    Deadlines are computed from the start time (start + n * period) instead of
+    sleeping a fixed amount after the work, so the time spent printing, calling
+    HTTP/Firestore or running the model does not add up into drift. Ticks that
+    could not be honoured because the work overran are skipped and counted.
+    """
+
+    def __init__(self, period, late_tolerance=None, clock=time.monotonic, sleep=time.sleep):
+        if not MIN_PERIOD <= period <= MAX_PERIOD:
+            raise ValueError(f"period must be between {MIN_PERIOD} and {MAX_PERIOD} seconds, got {period}")
+        self.period = period
+        # A tick is "late" when we wake up more than this after its deadline
+        self.late_tolerance = period * 0.1 if late_tolerance is None else late_tolerance
+        self._clock = clock
+        self._sleep = sleep
+        self._next_deadline = clock() + period
+        self.ticks = 0  # Deadlines reached
+        self.missed = 0  # Deadlines skipped because the loop fell behind
+        self.late = 0  # Deadlines reached, but later than the tolerance
+        self.last_lateness = 0.0
+        self.last_missed = 0
+
+    def wait(self):
+        """Sleep until the next deadline and return how many deadlines were missed."""
+        now = self._clock()
+        # Sleep can wake early as seen by a coarse clock (e.g. 15.6 ms on Windows), so re-check
+        while now < self._next_deadline:
+            self._sleep(self._next_deadline - now)
+            now = self._clock()
+
+        lateness = now - self._next_deadline
+        self.last_lateness = lateness
+        missed = int(lateness // self.period)
+        self.last_missed = missed
+        if missed:
+            self.missed += missed
+        if lateness > self.late_tolerance:
+            self.late += 1
+
+        # Stay on the original grid: jump past any deadlines we already missed
+        self._next_deadline += (missed + 1) * self.period
+        self.ticks += 1
+        return missed
+
+    def status(self):
+        """Short human-readable summary of the scheduler health."""
+        return f"Ticks: {self.ticks}, Missed: {self.missed}, Late: {self.late}"
+
+    def problem(self):
+        """Describe the last tick if it was missed or late, otherwise return None."""
+        if self.last_missed:
+            return f"Running behind: skipped {self.last_missed} tick(s) ({self.status()})"
+        if self.last_lateness > self.late_tolerance:
+            return f"Tick late by {self.last_lateness * 1000:.0f} ms ({self.status()})"
+        return None
+
+
+class Sampler:
+    """Samples a sensor every tick and hands back one averaged reading per simulated minute.
+
+    The leak detectors count minutes, so they are fed the minute averages: raising
+    the sampling rate adds samples per minute instead of speeding up simulated time.
+    """
+
+    def __init__(self, minute_duration, sample_period, report=print, **ticker_options):
+        if sample_period > minute_duration:
+            raise ValueError(f"sample_period ({sample_period}) must not exceed minute_duration ({minute_duration})")
+        samples_per_minute = round(minute_duration / sample_period)
+        if abs(samples_per_minute * sample_period - minute_duration) > 1e-9:
+            raise ValueError(f"sample_period ({sample_period}) must divide minute_duration ({minute_duration})")
+        self.ticker = Ticker(sample_period, **ticker_options)
+        self.samples_per_minute = samples_per_minute
+        self.report = report  # Where missed/late tick messages go
+        self._slot = 0  # Deadlines passed on the ticker's grid, skipped ones included
+
+    def tick(self):
+        """Wait for the next sample deadline, reporting it if it was missed or late."""
+        self.ticker.wait()
+        self._slot += 1 + self.ticker.last_missed
+        problem = self.ticker.problem()
+        if problem:
+            self.report(f"⏱️  {problem}")
+
+    def read_minute(self, read_sample):
+        """Call read_sample() once per tick until the next minute boundary and return the rounded average.
+
+        Minutes end on the grid (every samples_per_minute deadlines), so skipped
+        ticks shorten the current minute instead of pushing every later one back.
+        """
+        end = (self._slot // self.samples_per_minute + 1) * self.samples_per_minute
+        total = 0.0
+        samples = 0
+        while self._slot < end:
+            total += read_sample()
+            samples += 1
+            self.tick()
+        return round(total / samples, 2)
+
+    def wait_minutes(self, minutes=1):
+        end = (self._slot // self.samples_per_minute + minutes) * self.samples_per_minute
+        while self._slot < end:
+            self.tick()
@@ -0,0 +1,116 @@
+import curses
+import unittest
+
+from embedded_system import UsageView, clip
+
+
+class FakeWindow:
+    """Records what UsageView does to a curses window and keeps the resulting screen rows."""
+
+    def __init__(self, rows, cols=40):
+        self.size = (rows, cols)
+        self.screen = [""] * rows
+        self.calls = []
+        self.scrolling = False
+
+    def getmaxyx(self):
+        return self.size
+
+    def idlok(self, flag):
+        pass
+
+    def scrollok(self, flag):
+        self.scrolling = flag
+
+    def scroll(self, lines):
+        if not self.scrolling:
+            raise curses.error("scroll() without scrollok")
+        self.calls.append(("scroll", lines))
+        self.screen = self.screen[lines:] + [""] * lines
+
+    def erase(self):
+        self.calls.append(("erase",))
+        self.screen = [""] * self.size[0]
+
+    def move(self, row, col):
+        pass
+
+    def clrtoeol(self):
+        pass
+
+    def addstr(self, row, col, text):
+        self.calls.append(("addstr", row, text))
+        self.screen[row] = text
+
+    def noutrefresh(self):
+        self.calls.append(("noutrefresh",))
+
+
+class ClipTest(unittest.TestCase):
+    def test_plain_text(self):
+        self.assertEqual(clip("abc", 3), "abc")
+        self.assertEqual(clip("abc", 2), "ab")
+
+    def test_wide_emoji_takes_two_columns(self):
+        self.assertEqual(clip("🚰 Usage", 3), "🚰 ")
+        self.assertEqual(clip("🚰 Usage", 2), "🚰")
+        self.assertEqual(clip("🚰 Usage", 1), "")
+
+    def test_variation_selector_makes_the_emoji_wide(self):
+        # U+26A0 is narrow on its own, U+FE0F asks for the two-column emoji form
+        self.assertEqual(clip("⚠️ab", 3), "⚠️a")
+        self.assertEqual(clip("⚠️ab", 2), "⚠️")
+        self.assertEqual(clip("⚠️ab", 1), "")
+
+    def test_zero_width_joiner_takes_no_column(self):
+        family = "👨‍👩"
+        self.assertEqual(clip(family, 4), family)
+        self.assertEqual(clip(family + "x", 4), family)
+        self.assertEqual(clip(family, 3), "👨")
+
+
+class UsageViewTest(unittest.TestCase):
+    def draw(self, view, *lines):
+        for line in lines:
+            view.push(line)
+        view.win.calls.clear()
+        self.assertTrue(view.draw())
+        return view.win.calls
+
+    def test_first_fill_writes_from_the_top_without_scrolling(self):
+        view = UsageView(FakeWindow(4))
+        calls = self.draw(view, "a", "b")
+        self.assertEqual(calls, [("addstr", 0, "a"), ("addstr", 1, "b"), ("noutrefresh",)])
+        self.assertEqual(view.win.screen, ["a", "b", "", ""])
+        self.assertEqual(view.shown, 2)
+
+    def test_overflow_scrolls_and_writes_only_the_new_rows(self):
+        view = UsageView(FakeWindow(4))
+        self.draw(view, "a", "b", "c")
+        calls = self.draw(view, "d", "e")
+        self.assertEqual(calls, [("scroll", 1), ("addstr", 2, "d"), ("addstr", 3, "e"), ("noutrefresh",)])
+        self.assertEqual(view.win.screen, ["b", "c", "d", "e"])
+        self.assertEqual(view.shown, 4)
+        # Scrolling is switched off again once the explicit scroll is done
+        self.assertFalse(view.win.scrolling)
+
+    def test_more_lines_than_rows_repaints_from_the_ring_buffer(self):
+        view = UsageView(FakeWindow(4))
+        self.draw(view, "a")
+        calls = self.draw(view, *"bcdef")
+        self.assertEqual(calls[0], ("erase",))
+        self.assertNotIn("scroll", [call[0] for call in calls])
+        self.assertEqual(view.win.screen, ["c", "d", "e", "f"])
+        self.assertEqual(view.shown, 4)
+        # Incremental drawing carries on from the repainted screen
+        self.draw(view, "g")
+        self.assertEqual(view.win.screen, ["d", "e", "f", "g"])
+
+    def test_nothing_pending(self):
+        view = UsageView(FakeWindow(4))
+        self.assertFalse(view.draw())
+        self.assertEqual(view.win.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
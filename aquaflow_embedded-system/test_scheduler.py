@@ -0,0 +1,133 @@
+import unittest
+
+from scheduler import Sampler, Ticker
+
+
+class FakeClock:
+    """Manual clock: sleep() advances time by `step(duration)` instead of blocking."""
+
+    def __init__(self, step=None):
+        self.now = 100.0
+        self.step = step or (lambda duration: duration)
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, duration):
+        self.sleeps.append(duration)
+        self.now += self.step(duration)
+
+
+class TickerTest(unittest.TestCase):
+    def test_on_time_ticks_stay_on_the_grid(self):
+        clock = FakeClock()
+        ticker = Ticker(1.0, clock=clock, sleep=clock.sleep)
+        for expected in (101.0, 102.0, 103.0):
+            clock.now += 0.3  # Work done during the tick
+            self.assertEqual(ticker.wait(), 0)
+            self.assertAlmostEqual(clock.now, expected)
+        self.assertEqual((ticker.ticks, ticker.missed, ticker.late), (3, 0, 0))
+
+    def test_overrun_skips_missed_deadlines(self):
+        clock = FakeClock()
+        ticker = Ticker(1.0, clock=clock, sleep=clock.sleep)
+        clock.now += 3.5  # Work overran the deadlines at 101, 102 and 103
+        self.assertEqual(ticker.wait(), 2)
+        self.assertEqual((ticker.missed, ticker.late), (2, 1))
+        # Next deadline is back on the original grid
+        ticker.wait()
+        self.assertAlmostEqual(clock.now, 104.0)
+
+    def test_early_wake_sleeps_again(self):
+        # The first sleep wakes halfway, as seen by the clock
+        wakes = iter([0.5])
+        clock = FakeClock(step=lambda duration: next(wakes, duration))
+        ticker = Ticker(1.0, clock=clock, sleep=clock.sleep)
+        self.assertEqual(ticker.wait(), 0)
+        self.assertAlmostEqual(clock.now, 101.0)
+        self.assertEqual(clock.sleeps, [1.0, 0.5])
+        self.assertEqual((ticker.missed, ticker.late), (0, 0))
+        self.assertGreaterEqual(ticker.last_lateness, 0.0)
+
+    def test_problem_reports_late_and_missed_ticks(self):
+        clock = FakeClock()
+        ticker = Ticker(1.0, clock=clock, sleep=clock.sleep)
+        ticker.wait()
+        self.assertIsNone(ticker.problem())
+        clock.now += 1.5  # Half a period past the next deadline
+        ticker.wait()
+        self.assertIn("late by 500 ms", ticker.problem())
+        clock.now += 1.7  # 1.2 s past the deadline at 103
+        ticker.wait()
+        self.assertIn("skipped 1 tick(s)", ticker.problem())
+
+    def test_period_out_of_range(self):
+        with self.assertRaises(ValueError):
+            Ticker(0.01)
+        with self.assertRaises(ValueError):
+            Ticker(120)
+
+
+class SamplerTest(unittest.TestCase):
+    def make_sampler(self, minute_duration, sample_period):
+        clock = FakeClock()
+        reports = []
+        sampler = Sampler(minute_duration, sample_period, report=reports.append, clock=clock, sleep=clock.sleep)
+        return sampler, clock, reports
+
+    def test_minute_is_the_average_of_its_samples(self):
+        sampler, clock, reports = self.make_sampler(1.0, 0.1)
+        samples = iter([1.0] * 5 + [3.0] * 5)
+        self.assertEqual(sampler.samples_per_minute, 10)
+        self.assertEqual(sampler.read_minute(lambda: next(samples)), 2.0)
+        # A simulated minute still lasts minute_duration, whatever the sampling rate
+        self.assertAlmostEqual(clock.now, 101.0)
+        self.assertEqual(reports, [])
+
+    def test_wait_minutes_lasts_whole_minutes(self):
+        sampler, clock, _ = self.make_sampler(5.0, 0.5)
+        sampler.wait_minutes(2)
+        self.assertAlmostEqual(clock.now, 110.0)
+
+    def test_tick_problems_are_reported(self):
+        sampler, clock, reports = self.make_sampler(1.0, 0.1)
+        clock.now += 0.35
+        sampler.tick()
+        self.assertEqual(len(reports), 1)
+        self.assertIn("skipped 2 tick(s)", reports[0])
+
+    def test_minutes_stay_on_the_grid_despite_work_between_them(self):
+        sampler, clock, reports = self.make_sampler(1.0, 0.1)
+        boundaries = []
+        for _ in range(3):
+            sampler.read_minute(lambda: 1.0)
+            boundaries.append(clock.now)
+            clock.now += 0.45  # Push to Firestore between minutes
+        for expected, boundary in zip((101.0, 102.0, 103.0), boundaries):
+            self.assertAlmostEqual(boundary, expected)
+        # The skipped ticks are still reported
+        self.assertEqual(len(reports), 2)
+
+    def test_overrun_past_a_minute_boundary_shortens_the_next_minute(self):
+        sampler, clock, _ = self.make_sampler(1.0, 0.1)
+        sampler.read_minute(lambda: 1.0)
+        clock.now += 1.25  # Work overran the whole next minute
+        # The overrun minute closes right away with its single late sample
+        self.assertEqual(sampler.read_minute(lambda: 2.0), 2.0)
+        self.assertAlmostEqual(clock.now, 102.25)
+        # The following minute is shortened so it still ends on the grid
+        sampler.read_minute(lambda: 1.0)
+        self.assertAlmostEqual(clock.now, 103.0)
+
+    def test_sample_period_must_divide_the_minute(self):
+        with self.assertRaises(ValueError):
+            Sampler(1.0, 0.3)
+
+    def test_sample_period_longer_than_a_minute(self):
+        with self.assertRaises(ValueError):
+            Sampler(1.0, 2.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
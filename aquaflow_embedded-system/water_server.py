@@ -1,14 +1,15 @@
 import threading
-import time
 import random
 import socket
+from scheduler import Sampler
 
 # Global simulation state
 leak_mode = False
 water_shutoff = False
 high_usage_counter = 0
 threshold = 1.5
-minute_duration = 5  # 1 second = 1 simulated minute
+minute_duration = 5  # Seconds per simulated minute
+sample_period = minute_duration  # Seconds between flow sensor samples (0.1 to 60, must divide minute_duration)
 state_lock = threading.Lock()
 
 # Socket setup for receiving commands
@@ -54,14 +55,19 @@ def start_socket_server():
             threading.Thread(target=handle_client, args=(conn,), daemon=True).start()
 
 
+def read_flow_rate():
+    """One flow sensor sample, in liters per simulated minute."""
+    with state_lock:
+        if water_shutoff:
+            return 0.0
+        return random.uniform(2.0, 8.0) if leak_mode else random.uniform(0.4, 1.0)
+
+
 def simulate_water_usage():
     global leak_mode, water_shutoff, high_usage_counter
+    sampler = Sampler(minute_duration, sample_period)  # Drift-free sampling, averaged per simulated minute
     while True:
-        with state_lock:
-            if water_shutoff:
-                usage = 0.0
-            else:
-                usage = round(random.uniform(2.0, 8.0), 2) if leak_mode else round(random.uniform(0.4, 1.0), 2)
+        usage = sampler.read_minute(read_flow_rate)
 
         # Display with emojis
         if water_shutoff:
@@ -80,7 +86,7 @@ def simulate_water_usage():
         if high_usage_counter >= 5:
             print("⚠️  Leak detected! Waiting 2 minutes for response...")
             for _ in range(2):
-                time.sleep(minute_duration)
+                sampler.wait_minutes()
                 with state_lock:
                     if water_shutoff or not leak_mode:
                         print("✅  Leak resolved!")
@@ -93,8 +99,6 @@ def simulate_water_usage():
                         water_shutoff = True
                         print("🔒  Auto-shutoff: Water stopped!")
 
-        time.sleep(minute_duration)
-
 
 if __name__ == "__main__":
     # Start threads
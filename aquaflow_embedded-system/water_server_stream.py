@@ -1,11 +1,11 @@
 import threading
-import time
 import random
 import socket
 import requests  # Added for HTTP requests
 import firebase_admin
 from firebase_admin import credentials, firestore
 from datetime import datetime
+from scheduler import Sampler
 
 # 🔥 Initialize Firebase Admin
 cred = credentials.Certificate("aqwaflow-firebase-adminsdk-fbsvc-fca1477020.json")  # Update with actual path
@@ -31,7 +31,8 @@ leak_mode = False
 water_shutoff = False
 high_usage_counter = 0
 threshold = 1.5
-minute_duration = 4  # Simulated minutes (5 sec per real minute)
+minute_duration = 4  # Seconds per simulated minute
+sample_period = minute_duration  # Seconds between flow sensor samples (0.1 to 60, must divide minute_duration)
 state_lock = threading.Lock()
 
 # 🔌 Socket setup for commands
@@ -98,14 +99,18 @@ def start_socket_server():
             conn, _ = s.accept()
             threading.Thread(target=handle_client, args=(conn,), daemon=True).start()
 
+def read_flow_rate():
+    """One flow sensor sample, in liters per simulated minute."""
+    with state_lock:
+        if water_shutoff:
+            return 0.0
+        return random.uniform(2.0, 8.0) if leak_mode else random.uniform(0.4, 1.0)
+
 def simulate_water_usage():
     global leak_mode, water_shutoff, high_usage_counter
+    sampler = Sampler(minute_duration, sample_period)  # Drift-free sampling, averaged per simulated minute
     while True:
-        with state_lock:
-            if water_shutoff:
-                usage = 0.0
-            else:
-                usage = round(random.uniform(2.0, 8.0), 2) if leak_mode else round(random.uniform(0.4, 1.0), 2)
+        usage = sampler.read_minute(read_flow_rate)
 
         # 🖥️ Print status
         if water_shutoff:
@@ -127,7 +132,7 @@ def simulate_water_usage():
         if high_usage_counter >= 5:
             print("⚠️  Leak detected! Waiting 2 minutes for response...")
             for i in range(2):
-                time.sleep(minute_duration)
+                sampler.wait_minutes()
                 with state_lock:
                     if water_shutoff or not leak_mode:
                         print("✅ Leak resolved!")
@@ -140,8 +145,6 @@ def simulate_water_usage():
                         water_shutoff = True
                         print("🔒 Auto-shutoff: Water stopped!")
 
-        time.sleep(minute_duration)
-
 def listen_for_actions():
     """Listen for changes in the actions collection and update the state accordingly."""
     user_id = get_user_id()
@@ -1,5 +1,4 @@
 import threading
-import time
 import random
 import socket
 import requests  # For HTTP requests to fetch the user ID
@@ -11,6 +10,7 @@ from tensorflow.keras.models import load_model
 import tensorflow as tf
 from sklearn.preprocessing import StandardScaler
 from collections import deque
+from scheduler import Sampler
 
 #########################################
 # Firebase & ML Model Initialization
@@ -59,6 +59,7 @@ water_shutoff = False
 high_usage_counter = 0
 # Simulated minute duration (in seconds). For testing, you might use 10 seconds = 1 simulated minute.
 minute_duration = 10
+sample_period = minute_duration  # Seconds between flow sensor samples (0.1 to 60, must divide minute_duration)
 state_lock = threading.Lock()
 
 # Socket configuration for receiving commands
@@ -133,19 +134,24 @@ def start_socket_server():
 # Main Simulation Loop with ML Integration
 #########################################
 
+def read_flow_rate():
+    """One flow sensor sample, in liters per simulated minute."""
+    with state_lock:
+        if water_shutoff:
+            return 0.0
+        # Simulate high usage if leak_mode is manually activated, otherwise normal usage.
+        return random.uniform(2.0, 8.0) if leak_mode else random.uniform(0.4, 1.0)
+
 def simulate_water_usage():
     global leak_mode, water_shutoff, high_usage_counter
+    sampler = Sampler(minute_duration, sample_period)  # Drift-free sampling, averaged per simulated minute
 
     # Define an anomaly threshold for the model (tune this based on your model performance)
     anomaly_threshold = 0.5  # For example, if error > 0.5 L, consider it anomalous
 
     while True:
-        with state_lock:
-            if water_shutoff:
-                usage = 0.0
-            else:
-                # Simulate high usage if leak_mode is manually activated, otherwise normal usage.
-                usage = round(random.uniform(2.0, 8.0), 2) if leak_mode else round(random.uniform(0.4, 1.0), 2)
+        # The model works on per-minute readings, so feed it the average of the minute's samples
+        usage = sampler.read_minute(read_flow_rate)
 
         # Print water usage status
         if water_shutoff:
@@ -185,7 +191,7 @@ def simulate_water_usage():
         if high_usage_counter >= 5:
             print("⚠️  Anomaly detected for 5 consecutive intervals! Initiating auto-shutoff sequence...")
             for i in range(2):
-                time.sleep(minute_duration)
+                sampler.wait_minutes()
                 with state_lock:
                     if water_shutoff or not leak_mode:
                         print("✅ Leak resolved during waiting period!")
@@ -197,7 +203,6 @@ def simulate_water_usage():
                     if leak_mode and not water_shutoff:
                         water_shutoff = True
                         print("🔒 Auto-shutoff: Water stopped due to persistent anomaly!")
-        time.sleep(minute_duration)
 
 #########################################
 # Listen for Action Updates from Firestore
@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from scenarios import SCENARIOS
+
+# Missing packages that only mean the scenario cannot run here; any other missing module is a real breakage
+OPTIONAL_DEPENDENCIES = {"requests", "numpy", "sklearn", "tensorflow"}
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process in MB, or None where it cannot be measured."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    if sys.platform == "darwin":
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def run_worker(name, options, result_file):
+    """Run one scenario in this process and write its metrics to result_file."""
+    try:
+        result = {"status": "ok", **SCENARIOS[name](options)}
+    except ModuleNotFoundError as e:
+        if (e.name or "").split(".")[0] in OPTIONAL_DEPENDENCIES:
+            result = {"status": "skipped", "reason": str(e)}
+        else:
+            result = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    except Exception as e:
+        result = {"status": "error", "reason": f"{type(e).__name__}: {e}"}
+    result["peak_rss_mb"] = peak_rss_mb()
+    if result["peak_rss_mb"] is None:
+        result["peak_rss_reason"] = "resource module not available on this platform"
+    with open(result_file, "w") as f:
+        json.dump(result, f)
+
+
+def run_scenario(name, options):
+    """Run one scenario in a fresh interpreter so RSS and startup are not shared between scenarios."""
+    with tempfile.TemporaryDirectory() as tmp:
+        result_file = os.path.join(tmp, "result.json")
+        command = [sys.executable, os.path.abspath(__file__), "--worker", name,
+                   "--result-file", result_file, "--seed", str(options.seed)]
+        if options.quick:
+            command.append("--quick")
+        start = time.perf_counter()
+        try:
+            proc = subprocess.run(command, capture_output=True, text=True, timeout=options.timeout)
+        except subprocess.TimeoutExpired:
+            return {"status": "error", "reason": f"timed out after {options.timeout:g} s",
+                    "process_wall_s": round(time.perf_counter() - start, 3)}
+        wall = time.perf_counter() - start
+        if not os.path.exists(result_file):
+            return {"status": "error", "reason": proc.stderr.strip()[-500:], "process_wall_s": round(wall, 3)}
+        with open(result_file) as f:
+            result = json.load(f)
+    result["process_wall_s"] = round(wall, 3)
+    return result
+
+
+def flatten(result, prefix=""):
+    """{"latency": {"p95_ms": 1}} -> {"latency.p95_ms": 1}, numbers only (the workload is not a metric)."""
+    flat = {}
+    for key, value in result.items():
+        if key == "workload":
+            continue
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def compare(old_report, new_report):
+    """Print every numeric metric next to its value in an earlier report run with the same workload."""
+    for key in ("quick", "seed"):
+        if old_report.get(key) != new_report.get(key):
+            print(f"\n❌ Not comparing: {key} differs ({old_report.get(key)} vs {new_report.get(key)}), "
+                  f"so the workloads are not the same")
+            return
+    for name, new in new_report["scenarios"].items():
+        old = old_report["scenarios"].get(name)
+        if not old or old.get("status") != "ok" or new.get("status") != "ok":
+            continue
+        if old.get("workload") != new.get("workload"):
+            print(f"\n⚠️  {name}: workload changed ({old.get('workload')} vs {new.get('workload')}), skipping")
+            continue
+        print(f"\n📊 {name}")
+        old_flat = flatten(old)
+        for key, value in flatten(new).items():
+            if key not in old_flat:
+                continue
+            before = old_flat[key]
+            change = f"{(value - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"  {key:<28} {before:>12} → {value:<12} ({change})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AquaFlow end-to-end benchmarks with local stand-ins")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a fast smoke run")
+    parser.add_argument("--seed", type=int, default=42, help="Seed for the simulated readings")
+    parser.add_argument("--timeout", type=float, default=900, help="Per-scenario timeout in seconds")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.worker:
+        run_worker(options.worker, options, options.result_file)
+        return
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": options.seed,
+        "quick": options.quick,
+        "scenarios": {},
+    }
+    for name in options.scenario or list(SCENARIOS):
+        print(f"⏳ Running {name}...")
+        result = run_scenario(name, options)
+        report["scenarios"][name] = result
+        if result["status"] == "ok":
+            print(f"✅ {name}: {result.get('throughput_per_s')} ops/s, "
+                  f"p95 {result['latency'].get('p95_ms')} ms, peak RSS {result['peak_rss_mb']} MB")
+        else:
+            print(f"⚠️  {name} {result['status']}: {result['reason']}")
+
+    output = options.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results written to {output}")
+
+    if options.compare:
+        with open(options.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+import contextlib
+import csv
+import importlib
+import itertools
+import os
+import random
+import socket
+import sys
+import threading
+import time
+
+from standins import InMemoryFirestore, UserIdService, install_firebase_stand_in
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EMBEDDED_DIR = os.path.join(REPO_ROOT, "aquaflow_embedded-system")
+DATASET_PATH = os.path.join(REPO_ROOT, "aquaflow_ml", "dataset", "water_usage_300_days.csv")
+
+COMMANDS = ["make a leak", "status", "stop leak", "stop water", "start water"]
+
+#########################################
+# Helpers
+#########################################
+
+
+def load_script(name):
+    """Import one of the embedded-system scripts the way it is normally run (from its own directory)."""
+    os.chdir(EMBEDDED_DIR)
+    if EMBEDDED_DIR not in sys.path:
+        sys.path.insert(0, EMBEDDED_DIR)
+    return importlib.import_module(name)
+
+
+def summarize(samples):
+    """Latency percentiles (milliseconds) for a list of durations in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def read_dataset(limit=None):
+    with open(DATASET_PATH, newline="") as f:
+        usage = (float(row["water_usage_liters"]) for row in csv.DictReader(f))
+        return list(itertools.islice(usage, limit))
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.005)
+
+
+def start_stream_stack():
+    """water_server_stream wired to the in-memory Firestore and a local user-ID service."""
+    db = InMemoryFirestore()
+    install_firebase_stand_in(db)
+    service = UserIdService().start()
+    stream = load_script("water_server_stream")
+    stream.USER_ID_API = f"{service.url}/get_user"
+    return stream, db, service
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the per-reading prints of the scripts while measuring."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+#########################################
+# Scenarios
+#########################################
+
+
+def command_storm(options):
+    """Many clients hammering the water_server.py command socket with round-trip commands."""
+    clients = 10 if options.quick else 50
+    per_client = 50 if options.quick else 200
+
+    start = time.perf_counter()
+    server = load_script("water_server")
+    server.PORT = free_port()
+    threading.Thread(target=server.start_socket_server, daemon=True).start()
+    wait_for_port(server.HOST, server.PORT)
+    startup = time.perf_counter() - start
+
+    latencies = []
+    errors = []
+
+    def client(index):
+        rng = random.Random(options.seed + index)
+        try:
+            with socket.create_connection((server.HOST, server.PORT)) as s:
+                for _ in range(per_client):
+                    sent = time.perf_counter()
+                    s.sendall(rng.choice(COMMANDS).encode())
+                    s.recv(1024)
+                    latencies.append(time.perf_counter() - sent)
+        except OSError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    begin = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - begin
+
+    return {
+        "startup_s": round(startup, 4),
+        "workload": {"clients": clients, "commands_per_client": per_client},
+        "commands": len(latencies),
+        "errors": len(errors),
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+def single_meter(options):
+    """One meter pushing readings through water_server_stream as fast as the data path allows."""
+    readings = 200 if options.quick else 2000
+    rng = random.Random(options.seed)
+
+    start = time.perf_counter()
+    stream, db, service = start_stream_stack()
+    startup = time.perf_counter() - start
+
+    latencies = []
+    begin = time.perf_counter()
+    with quiet():
+        for _ in range(readings):
+            sent = time.perf_counter()
+            stream.push_water_usage_to_firebase(round(rng.uniform(0.4, 1.0), 2))
+            latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - begin
+    service.stop()
+
+    return {
+        "startup_s": round(startup, 4),
+        "workload": {"readings": readings},
+        "documents_written": db.count("users", service.user_id, "water_usage"),
+        "throughput_per_s": round(readings / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+def many_meters(options):
+    """1k meters, each paced by the scheduler at one reading per second, sharing one data path."""
+    meters = 100 if options.quick else 1000
+    duration = 3.0 if options.quick else 10.0
+    period = 1.0
+    readings_per_meter = round(duration / period)
+
+    start = time.perf_counter()
+    stream, db, service = start_stream_stack()
+    Ticker = load_script("scheduler").Ticker
+    startup = time.perf_counter() - start
+
+    latencies = []
+    lateness = []
+    missed = []
+
+    def meter(index):
+        rng = random.Random(options.seed + index)
+        ticker = Ticker(period)
+        for _ in range(readings_per_meter):
+            sent = time.perf_counter()
+            stream.push_water_usage_to_firebase(round(rng.uniform(0.4, 1.0), 2))
+            latencies.append(time.perf_counter() - sent)
+            ticker.wait()
+            lateness.append(ticker.last_lateness)
+        missed.append(ticker.missed)
+
+    threads = [threading.Thread(target=meter, args=(i,), daemon=True) for i in range(meters)]
+    begin = time.perf_counter()
+    with quiet():
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    elapsed = time.perf_counter() - begin
+    service.stop()
+
+    return {
+        "startup_s": round(startup, 4),
+        "workload": {"meters": meters, "readings_per_meter": readings_per_meter, "period_s": period},
+        "readings": len(latencies),
+        "documents_written": db.count("users", service.user_id, "water_usage"),
+        "throughput_per_s": round(len(latencies) / elapsed, 1),
+        "missed_ticks": sum(missed),
+        "latency": summarize(latencies),
+        "tick_lateness": summarize(lateness),
+    }
+
+
+def ml_scoring(options):
+    """LSTM scoring cost per reading, using the model and preprocessing of water_server_with_ml.py."""
+    windows = 50 if options.quick else 500
+
+    start = time.perf_counter()
+    install_firebase_stand_in(InMemoryFirestore())
+    ml = load_script("water_server_with_ml")
+    np = ml.np
+    startup = time.perf_counter() - start
+
+    usage = read_dataset(windows + ml.seq_length)
+    latencies = []
+    begin = time.perf_counter()
+    for i in range(windows):
+        sent = time.perf_counter()
+        input_array = np.array(usage[i:i + ml.seq_length]).reshape(-1, 1)
+        scaled_input = ml.scaler.transform(input_array).reshape(1, ml.seq_length, 1)
+        ml.model.predict(scaled_input, verbose=0)
+        latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - begin
+
+    return {
+        "startup_s": round(startup, 4),
+        "workload": {"windows": windows},
+        "throughput_per_s": round(windows / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+def csv_replay(options):
+    """Replay the 300-day dataset through the water_server_stream data path as fast as possible."""
+    limit = 1440 if options.quick else None  # One day of minute readings in quick mode
+
+    start = time.perf_counter()
+    stream, db, service = start_stream_stack()
+    usage = read_dataset(limit)
+    startup = time.perf_counter() - start
+
+    latencies = []
+    begin = time.perf_counter()
+    with quiet():
+        for value in usage:
+            sent = time.perf_counter()
+            stream.push_water_usage_to_firebase(value)
+            latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - begin
+    service.stop()
+
+    return {
+        "startup_s": round(startup, 4),
+        "workload": {"rows": len(usage)},
+        "documents_written": db.count("users", service.user_id, "water_usage"),
+        "throughput_per_s": round(len(usage) / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+SCENARIOS = {
+    "command_storm": command_storm,
+    "single_meter": single_meter,
+    "many_meters": many_meters,
+    "ml_scoring": ml_scoring,
+    "csv_replay": csv_replay,
+}
@@ -0,0 +1,181 @@
+import itertools
+import json
+import sys
+import threading
+import types
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#########################################
+# In-memory Firestore
+#########################################
+
+
+class DocumentSnapshot:
+    """Minimal snapshot passed to on_snapshot callbacks (only what the scripts use)."""
+
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class DocumentReference:
+    def __init__(self, db, path):
+        self._db = db
+        self._path = path
+        self.id = path[-1]
+
+    def collection(self, name):
+        return CollectionReference(self._db, self._path + (name,))
+
+    def set(self, data):
+        self._db._write(self._path, data)
+
+    def get(self):
+        return DocumentSnapshot(self.id, self._db._read(self._path))
+
+
+class CollectionReference:
+    def __init__(self, db, path):
+        self._db = db
+        self._path = path
+
+    def document(self, doc_id=None):
+        if doc_id is None:
+            doc_id = self._db._next_id()
+        return DocumentReference(self._db, self._path + (doc_id,))
+
+    def add(self, data):
+        ref = self.document()
+        ref.set(data)
+        return datetime.utcnow(), ref
+
+    def stream(self):
+        return self._db._documents(self._path)
+
+    def on_snapshot(self, callback):
+        """Call back with the whole collection now and after every write to it."""
+        self._db._watch(self._path, callback)
+        callback(self.stream(), [], datetime.utcnow())
+
+
+class InMemoryFirestore:
+    """Stand-in for firestore.client(): documents live in a dict keyed by their path."""
+
+    def __init__(self):
+        self._docs = {}
+        self._watchers = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def collection(self, name):
+        return CollectionReference(self, (name,))
+
+    def count(self, *path):
+        """Number of documents stored directly under the given collection path."""
+        with self._lock:
+            return sum(1 for doc_path in self._docs if doc_path[:-1] == path)
+
+    def _next_id(self):
+        return f"doc{next(self._ids)}"
+
+    def _write(self, path, data):
+        with self._lock:
+            self._docs[path] = dict(data)
+            watchers = list(self._watchers.get(path[:-1], ()))
+        if watchers:
+            docs = self._documents(path[:-1])
+            for callback in watchers:
+                callback(docs, [], datetime.utcnow())
+
+    def _read(self, path):
+        with self._lock:
+            return dict(self._docs.get(path, {}))
+
+    def _documents(self, collection_path):
+        with self._lock:
+            return [DocumentSnapshot(path[-1], data) for path, data in self._docs.items()
+                    if path[:-1] == collection_path]
+
+    def _watch(self, collection_path, callback):
+        with self._lock:
+            self._watchers.setdefault(collection_path, []).append(callback)
+
+
+def install_firebase_stand_in(db):
+    """Register a fake firebase_admin package so the scripts import against `db` without credentials."""
+    firebase_admin = types.ModuleType("firebase_admin")
+    credentials = types.ModuleType("firebase_admin.credentials")
+    firestore = types.ModuleType("firebase_admin.firestore")
+
+    credentials.Certificate = lambda path: path
+    firestore.client = lambda app=None: db
+    firebase_admin.initialize_app = lambda credential=None, options=None, name=None: None
+    firebase_admin.credentials = credentials
+    firebase_admin.firestore = firestore
+
+    sys.modules["firebase_admin"] = firebase_admin
+    sys.modules["firebase_admin.credentials"] = credentials
+    sys.modules["firebase_admin.firestore"] = firestore
+
+
+#########################################
+# User-ID service (same routes as firebase_server.py)
+#########################################
+
+
+class UserIdHTTPServer(ThreadingHTTPServer):
+    # socketserver's default backlog of 5 drops connections when many meters hit it at once
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class UserIdService:
+    """Serves /get_user and /set_user like aquaflow_backend/firebase_server.py, without Flask or Firebase."""
+
+    def __init__(self, user_id="bench-user", host="127.0.0.1", port=0):
+        self.user_id = user_id
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/get_user":
+                    return self._reply(404, {"error": "Not found"})
+                if service.user_id:
+                    return self._reply(200, {"user_id": service.user_id})
+                return self._reply(400, {"error": "No user logged in"})
+
+            def do_POST(self):
+                if self.path != "/set_user":
+                    return self._reply(404, {"error": "Not found"})
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                if "user_id" in data:
+                    service.user_id = data["user_id"]
+                    return self._reply(200, {"message": f"User ID set to {service.user_id}"})
+                return self._reply(400, {"error": "No user ID provided"})
+
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        self._server = UserIdHTTPServer((host, port), Handler)
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()